@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+pytest.importorskip("pyluwen")
+
+from tt_burnin.chip import GsChip, WhChip
+
+
+class FakeLuwenChip:
+    def __init__(self, harvest_bits=0):
+        self.harvest_bits = harvest_bits
+
+    def pci_interface_id(self):
+        return 0
+
+    def axi_read(self, addr, buf):
+        buf[:] = bytes((addr + i) & 0xFF for i in range(len(buf)))
+
+    spi_read = axi_read
+
+    def arc_msg(self, msg, *args, **kwargs):
+        assert msg == 0x57
+        return (self.harvest_bits, 0)
+
+
+@pytest.mark.parametrize("chip_cls", [GsChip, WhChip])
+def test_tensix_locations_unharvested(chip_cls):
+    cores = chip_cls(FakeLuwenChip()).get_tensix_locations()
+    assert cores == {
+        (x, y) for y in chip_cls._ALL_TENSIX_ROWS for x in chip_cls._ALL_TENSIX_COLS
+    }
+
+
+def test_gs_harvesting_bit_disables_row():
+    # Rows are counted from the bottom of the grid, bit 0 is NOC 0 row 5.
+    cores = GsChip(FakeLuwenChip(0b1)).get_tensix_locations()
+    assert {y for _, y in cores} == set(GsChip._ALL_TENSIX_ROWS) - {5}
+
+
+def test_wh_harvesting_bit_disables_row():
+    # Bit 0 is physical row 1.
+    cores = WhChip(FakeLuwenChip(0b1)).get_tensix_locations()
+    assert {y for _, y in cores} == set(WhChip._ALL_TENSIX_ROWS) - {11}
+
+
+@pytest.mark.parametrize("chip_cls", [GsChip, WhChip])
+def test_harvesting_bits_outside_grid_are_ignored(chip_cls):
+    low = chip_cls(FakeLuwenChip(0b101)).get_tensix_locations()
+    high = chip_cls(FakeLuwenChip(0b101 | 1 << 11 | 1 << 20)).get_tensix_locations()
+    assert high == low
+
+
+@pytest.mark.parametrize("read", ["axi_read", "spi_read"])
+def test_read_returns_filled_bytearray(read):
+    data = getattr(WhChip(FakeLuwenChip()), read)(0x10, 4)
+    # Callers that compared against or sliced the old bytes result still work.
+    assert isinstance(data, bytearray)
+    assert data == b"\x10\x11\x12\x13"
+    assert bytes(data[1:3]) == b"\x11\x12"
+
+
+@pytest.mark.parametrize("read", ["axi_read", "spi_read"])
+def test_read_into_out_fills_its_start(read):
+    out = bytearray(b"\xff" * 6)
+    assert getattr(WhChip(FakeLuwenChip()), read)(0x10, 4, out=out) is out
+    assert out == b"\x10\x11\x12\x13\xff\xff"
+
+
+@pytest.mark.parametrize("read", ["axi_read", "spi_read"])
+def test_read_rejects_short_out(read):
+    with pytest.raises(ValueError):
+        getattr(WhChip(FakeLuwenChip()), read)(0, 8, out=bytearray(4))
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("pyluwen")
+pytest.importorskip("tt_tools_common")
+
+from tt_burnin import main
+from tt_burnin.chip import WhChip
+
+
+class FakeLuwenChip:
+    def __init__(self, interface_id, fail_msg=None):
+        self.interface_id = interface_id
+        self.fail_msg = fail_msg
+        self.calls = []
+
+    def pci_interface_id(self):
+        return self.interface_id
+
+    def arc_msg(self, msg, *args, **kwargs):
+        if msg == self.fail_msg:
+            raise RuntimeError(f"arc_msg {msg:#x} failed")
+        self.calls.append(("arc_msg", msg))
+
+    def noc_broadcast32(self, noc, addr, data):
+        self.calls.append(("noc_broadcast32", data))
+
+
+# A subclass, so the handlers are found through the mro
+class FakeWhChip(WhChip):
+    __slots__ = ()
+
+    def get_tensix_locations(self):
+        return frozenset()
+
+
+@pytest.fixture
+def barriers(monkeypatch):
+    monkeypatch.setattr(main, "load_ttx_file", lambda chip, ttx, mapping: None)
+    monkeypatch.setattr(main, "get_ttx_file", lambda name: None)
+
+    created = []
+
+    class RecordingBarrier(threading.Barrier):
+        def __init__(self, parties, *args, **kwargs):
+            super().__init__(parties, *args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(threading, "Barrier", RecordingBarrier)
+    return created
+
+
+def test_start_and_stop_all_groups(barriers):
+    local, remote, other = FakeLuwenChip(0), FakeLuwenChip(0), FakeLuwenChip(1)
+    devices = [FakeWhChip(chip) for chip in (local, remote, other)]
+    started = []
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        main.start_burnin_on_devices(executor, devices, started)
+        assert [barrier.parties for barrier in barriers] == [2]
+
+        for chip in (local, remote, other):
+            assert chip.calls[-1] == ("noc_broadcast32", main.RUN_SOFT_RESETS)
+
+        main.stop_burnin_on_devices(executor, started)
+
+    assert {device for device, _ in started} == set(devices)
+    for chip in (local, remote, other):
+        assert chip.calls[-2:] == [
+            ("arc_msg", 0x54),
+            ("noc_broadcast32", main.ALL_SOFT_RESETS),
+        ]
+
+
+def test_failed_group_surfaces_its_error_and_is_stopped(barriers):
+    good, bad = FakeLuwenChip(0), FakeLuwenChip(1, fail_msg=0x52)
+    devices = [FakeWhChip(good), FakeWhChip(bad)]
+    started = []
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # The good group sees BrokenBarrierError, the cause is what's reported
+        with pytest.raises(RuntimeError, match="arc_msg 0x52 failed"):
+            main.start_burnin_on_devices(executor, devices, started)
+        assert [barrier.parties for barrier in barriers] == [2]
+        assert barriers[0].broken
+
+        # Neither device was released from soft reset
+        for chip in (good, bad):
+            assert ("noc_broadcast32", main.RUN_SOFT_RESETS) not in chip.calls
+
+        main.stop_burnin_on_devices(executor, started)
+
+    # The partly started device is still stopped
+    assert {device for device, _ in started} == set(devices)
+    for chip in (good, bad):
+        assert chip.calls[-2:] == [
+            ("arc_msg", 0x54),
+            ("noc_broadcast32", main.ALL_SOFT_RESETS),
+        ]
+
+
+def test_unsupported_chip_is_rejected():
+    with pytest.raises(NotImplementedError):
+        main._chip_handlers(object())
@@ -3,10 +3,10 @@
 
 from __future__ import annotations
 
-from abc import abstractmethod
+from abc import ABC, abstractmethod
+import functools
 import time
-from typing import Union
-import itertools
+from typing import Optional, Union
 import sys
 
 from pyluwen import PciChip, Telemetry
@@ -14,65 +14,124 @@ from pyluwen import detect_chips as luwen_detect_chips
 from pyluwen import detect_chips_fallible as luwen_detect_chips_fallible
 
 
-class TTChip:
-    def __init__(self, chip: PciChip):
-        self.luwen_chip = chip
-        self.interface_id = chip.pci_interface_id()
+def _vnum_to_version(version: int) -> tuple[int, int, int, int]:
+    return (
+        (version >> 24) & 0xFF,
+        (version >> 16) & 0xFF,
+        (version >> 8) & 0xFF,
+        version & 0xFF,
+    )
 
-        self._harvesting_bits = None
 
-        self.telmetry_cache = None
+# Given non-negative integer x, return a list of the bits set in x, in increasing order.
+def _int_to_bits(x: int) -> list[int]:
+    bits = []
+    while x:
+        # Isolate the lowest set bit, so only set bits are visited.
+        low = x & -x
+        bits.append(low.bit_length() - 1)
+        x ^= low
+    return bits
 
-    def reinit(self, callback=None):
-        self.luwen_chip = PciChip(self.interface_id)
-        self.telmetry_cache = None
 
-        chip_count = 0
-        block_count = 0
-        last_draw = time.time()
+def _check_out_size(out: bytearray, size: int) -> None:
+    if len(out) < size:
+        raise ValueError(f"Output buffer of {len(out)} bytes can't hold {size} bytes")
+
+
+class _ChipDetectProgress:
+    """Chip detection callback that draws a live "Detected Chips" counter."""
+
+    __slots__ = ("chip_count", "block_count", "last_draw", "tty")
 
-        def chip_detect_callback(status):
-            nonlocal chip_count, last_draw, block_count
+    def __init__(self):
+        # stdout won't change mid-detection, check it once instead of per update
+        self.tty = sys.stdout.isatty()
+        self.chip_count = 0
+        self.block_count = 0
+        self.last_draw = time.monotonic()
 
-            if status.new_chip():
-                chip_count += 1
-            elif status.correct_down():
-                chip_count -= 1
-            chip_count = max(chip_count, 0)
+    def __call__(self, status):
+        if status.new_chip():
+            self.chip_count += 1
+        elif status.correct_down():
+            self.chip_count -= 1
+        self.chip_count = max(self.chip_count, 0)
+
+        if self.tty:
+            current_time = time.monotonic()
+            if current_time - self.last_draw > 0.1:
+                self.last_draw = current_time
+
+                # Build the whole frame and emit it with one write and one flush
+                frame = []
+                if self.block_count > 0:
+                    frame.append(f"\033[{self.block_count}A\033[J")
+
+                frame.append(f"\rDetected Chips: {self.chip_count}\n")
+                self.block_count = 1
 
-            if sys.stdout.isatty():
-                current_time = time.time()
-                if current_time - last_draw > 0.1:
-                    last_draw = current_time
+                status_string = status.status_string()
+                if status_string is not None:
+                    lines = status_string.splitlines()
+                    self.block_count += len(lines)
+                    frame.extend(f"\r{line}\n" for line in lines)
+
+                sys.stdout.write("".join(frame))
+                sys.stdout.flush()
+
+
+class TTChip(ABC):
+    __slots__ = (
+        "luwen_chip",
+        "interface_id",
+        "_harvesting_bits",
+        "_tensix_locations_cache",
+        "_broadcast_cores",
+        "_board_type",
+        "_telemetry_cache",
+        "_fw_versions",
+    )
+
+    # Whether noc_broadcast is a single hardware broadcast rather than a write
+    # per core.
+    HARDWARE_BROADCAST = True
+
+    def __init__(self, chip: PciChip):
+        self.luwen_chip = chip
+        self.interface_id = chip.pci_interface_id()
 
-                    if block_count > 0:
-                        print(f"\033[{block_count}A", end="", flush=True)
-                        print(f"\033[J", end="", flush=True)
+        self._harvesting_bits = None
+        self._tensix_locations_cache = None
+        self._broadcast_cores = None
+        self._board_type = None
 
-                    print(f"\rDetected Chips: {chip_count}\n", end="", flush=True)
-                    block_count = 1
+        self._telemetry_cache = None
+        self._fw_versions = {}
 
-                    status_string = status.status_string()
-                    if status_string is not None:
-                        for line in status_string.splitlines():
-                            block_count += 1
-                            print(f"\r{line}", flush=True)
-            else:
-                time.sleep(0.01)
+    def reinit(self, callback=None):
+        self.luwen_chip = PciChip(self.interface_id)
+        self._telemetry_cache = None
+        self._fw_versions = {}
+        self._tensix_locations_cache = None
+        self._broadcast_cores = None
+        self._board_type = None
 
         self.luwen_chip.init(
-            callback=chip_detect_callback if callback is None else callback
+            callback=_ChipDetectProgress() if callback is None else callback
         )
 
     def get_telemetry(self) -> Telemetry:
-        self.telmetry_cache = self.luwen_chip.get_telemetry()
-        return self.telmetry_cache
+        self._telemetry_cache = self.luwen_chip.get_telemetry()
+        self._fw_versions = {}
+        return self._telemetry_cache
 
     def get_telemetry_unchanged(self) -> Telemetry:
-        if self.telmetry_cache is None:
-            self.telmetry_cache = self.luwen_chip.get_telemetry()
+        telemetry = self._telemetry_cache
+        if telemetry is None:
+            telemetry = self.get_telemetry()
 
-        return self.telmetry_cache
+        return telemetry
 
     def get_harvest_bits(self) -> int:
         if self._harvesting_bits is None:
@@ -81,28 +140,28 @@ class TTChip:
             self._harvesting_bits = bad_row_bits
         return self._harvesting_bits
 
-    def __vnum_to_version(self, version: int) -> tuple[int, int, int, int]:
-        return (
-            (version >> 24) & 0xFF,
-            (version >> 16) & 0xFF,
-            (version >> 8) & 0xFF,
-            version & 0xFF,
-        )
+    # Decoded versions are kept until the next telemetry refresh.
+    def _fw_version(self, field: str) -> tuple[int, int, int, int]:
+        version = self._fw_versions.get(field)
+        if version is None:
+            telem = self._telemetry_cache or self.get_telemetry()
+            version = _vnum_to_version(getattr(telem, field))
+            self._fw_versions[field] = version
+        return version
 
     def m3_fw_app_version(self):
-        telem = self.get_telemetry_unchanged()
-        return self.__vnum_to_version(telem.smbus_tx_m3_app_fw_version)
+        return self._fw_version("smbus_tx_m3_app_fw_version")
 
     def smbus_fw_version(self):
-        telem = self.get_telemetry_unchanged()
-        return self.__vnum_to_version(telem.smbus_tx_arc1_fw_version)
+        return self._fw_version("smbus_tx_arc1_fw_version")
 
     def arc_l2_fw_version(self):
-        telem = self.get_telemetry_unchanged()
-        return self.__vnum_to_version(telem.smbus_tx_arc0_fw_version)
+        return self._fw_version("smbus_tx_arc0_fw_version")
 
     def board_type(self):
-        return self.luwen_chip.pci_board_type()
+        if self._board_type is None:
+            self._board_type = self.luwen_chip.pci_board_type()
+        return self._board_type
 
     def noc_read(self, noc: int, x: int, y: int, addr: int, data: bytes):
         self.luwen_chip.noc_read(noc, x, y, addr, data)
@@ -131,20 +190,43 @@ class TTChip:
     def axi_read32(self, addr: int) -> int:
         return self.luwen_chip.axi_read32(addr)
 
-    def axi_read(self, addr: int, size: int) -> bytes:
-        data = bytearray(size)
-        self.luwen_chip.axi_read(addr, data)
+    # Fill buf (anything writable that supports the buffer protocol) in place.
+    def axi_read_into(self, addr: int, buf: bytearray) -> bytearray:
+        self.luwen_chip.axi_read(addr, buf)
+
+        return buf
 
-        return bytes(data)
+    # The read buffer is returned as-is rather than copied into a bytes object.
+    # Pass out to reuse a buffer across reads; it is filled from its start.
+    def axi_read(
+        self, addr: int, size: int, out: Optional[bytearray] = None
+    ) -> bytearray:
+        if out is None:
+            return self.axi_read_into(addr, bytearray(size))
+
+        _check_out_size(out, size)
+        self.axi_read_into(addr, memoryview(out)[:size])
+        return out
 
     def spi_write(self, addr: int, data: bytes):
         self.luwen_chip.spi_write(addr, data)
 
-    def spi_read(self, addr: int, size: int) -> bytes:
-        data = bytearray(size)
-        self.luwen_chip.spi_read(addr, data)
+    # Fill buf (anything writable that supports the buffer protocol) in place.
+    def spi_read_into(self, addr: int, buf: bytearray) -> bytearray:
+        self.luwen_chip.spi_read(addr, buf)
+
+        return buf
 
-        return bytes(data)
+    # Same as axi_read: the read buffer is returned as-is, or out is filled.
+    def spi_read(
+        self, addr: int, size: int, out: Optional[bytearray] = None
+    ) -> bytearray:
+        if out is None:
+            return self.spi_read_into(addr, bytearray(size))
+
+        _check_out_size(out, size)
+        self.spi_read_into(addr, memoryview(out)[:size])
+        return out
 
     def arc_msg(self, *args, **kwargs):
         return self.luwen_chip.arc_msg(*args, **kwargs)
@@ -153,55 +235,66 @@ class TTChip:
     def min_fw_version(self):
         pass
 
-    # Given non-negative integer x, return an iterable containing the bits set in x, in increasing order.
-    def _int_to_bits(self, x):
-        return list(filter(lambda b: x & (1 << b), range(x.bit_length())))
-
 
 def reverse_mapping_list(l):
-    ret = [0] * len(l)
-    for idx, val in enumerate(l):
-        ret[val] = idx
-    return ret
+    # For a permutation, the inverse is the argsort; sorted() does it in C.
+    return sorted(range(len(l)), key=l.__getitem__)
 
 
-class WhChip(TTChip):
-    def __init__(self, *args, **kwargs):
-        self.GRID_SIZE_X = 10
-        self.GRID_SIZE_Y = 12
-        self.NUM_TENSIX_X = self.GRID_SIZE_X - 2
-        self.NUM_TENSIX_Y = self.GRID_SIZE_Y - 2
-
-        self.PHYS_X_TO_NOC_0_X = [0, 9, 1, 8, 2, 7, 3, 6, 4, 5]
-        self.PHYS_Y_TO_NOC_0_Y = [0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6]
-        self.PHYS_X_TO_NOC_1_X = [9, 0, 8, 1, 7, 2, 6, 3, 5, 4]
-        self.PHYS_Y_TO_NOC_1_Y = [11, 0, 10, 1, 9, 2, 8, 3, 7, 4, 6, 5]
-        self.NOC_0_X_TO_PHYS_X = reverse_mapping_list(self.PHYS_X_TO_NOC_0_X)
-        self.NOC_0_Y_TO_PHYS_Y = reverse_mapping_list(self.PHYS_Y_TO_NOC_0_Y)
-        self.NOC_1_X_TO_PHYS_X = reverse_mapping_list(self.PHYS_X_TO_NOC_1_X)
-        self.NOC_1_Y_TO_PHYS_Y = reverse_mapping_list(self.PHYS_Y_TO_NOC_1_Y)
-
-        super().__init__(*args, **kwargs)
-
-    def get_tensix_locations(self):
-        all_tensix_rows = [1, 2, 3, 4, 5, 7, 8, 9, 10, 11]
-        all_tensix_cols = [1, 2, 3, 4, 6, 7, 8, 9]
+# The core set only depends on the harvesting bits and the architecture's
+# tables, so it is shared between every chip with the same harvesting and
+# survives reinit().
+@functools.lru_cache(maxsize=64)
+def _good_tensix_cores(
+    bad_row_bits: int,
+    harvest_bit_to_noc_0_y: bytes,
+    tensix_rows: tuple[int, ...],
+    tensix_cols: tuple[int, ...],
+) -> frozenset[tuple[int, int]]:
+    # Bits past the end of the table don't name a row in the grid.
+    bad_row_bits &= (1 << len(harvest_bit_to_noc_0_y)) - 1
+    disabled_rows = {harvest_bit_to_noc_0_y[b] for b in _int_to_bits(bad_row_bits)}
 
-        # Magic value to get harvesting info
-        bad_row_bits = self.get_harvest_bits()
+    return frozenset(
+        (x, y) for y in tensix_rows if y not in disabled_rows for x in tensix_cols
+    )
 
-        bad_row_bits = bad_row_bits << 1
 
-        bad_physical_rows = self._int_to_bits(bad_row_bits)
-
-        disabled_rows = frozenset(
-            map(lambda y: self.PHYS_Y_TO_NOC_0_Y[y], bad_physical_rows)
-        )
-
-        good_rows = filter(lambda y: y not in disabled_rows, all_tensix_rows)
-        good_cores = itertools.product(all_tensix_cols, good_rows)
+class WhChip(TTChip):
+    __slots__ = ()
+
+    # Architecture constants, shared by every instance. The coordinate tables
+    # are bytes, a compact table of small ints that still indexes to int.
+    GRID_SIZE_X = 10
+    GRID_SIZE_Y = 12
+    NUM_TENSIX_X = GRID_SIZE_X - 2
+    NUM_TENSIX_Y = GRID_SIZE_Y - 2
+
+    PHYS_X_TO_NOC_0_X = bytes((0, 9, 1, 8, 2, 7, 3, 6, 4, 5))
+    PHYS_Y_TO_NOC_0_Y = bytes((0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6))
+    PHYS_X_TO_NOC_1_X = bytes((9, 0, 8, 1, 7, 2, 6, 3, 5, 4))
+    PHYS_Y_TO_NOC_1_Y = bytes((11, 0, 10, 1, 9, 2, 8, 3, 7, 4, 6, 5))
+    NOC_0_X_TO_PHYS_X = bytes(reverse_mapping_list(PHYS_X_TO_NOC_0_X))
+    NOC_0_Y_TO_PHYS_Y = bytes(reverse_mapping_list(PHYS_Y_TO_NOC_0_Y))
+    NOC_1_X_TO_PHYS_X = bytes(reverse_mapping_list(PHYS_X_TO_NOC_1_X))
+    NOC_1_Y_TO_PHYS_Y = bytes(reverse_mapping_list(PHYS_Y_TO_NOC_1_Y))
+
+    # Harvesting bit b marks physical row b + 1 as bad, this maps it straight
+    # to the NOC 0 row it disables.
+    HARVEST_BIT_TO_NOC_0_Y = PHYS_Y_TO_NOC_0_Y[1:]
+
+    _ALL_TENSIX_COLS = (1, 2, 3, 4, 6, 7, 8, 9)
+    _ALL_TENSIX_ROWS = (1, 2, 3, 4, 5, 7, 8, 9, 10, 11)
 
-        return set(good_cores)
+    def get_tensix_locations(self):
+        if self._tensix_locations_cache is None:
+            self._tensix_locations_cache = _good_tensix_cores(
+                self.get_harvest_bits(),
+                self.HARVEST_BIT_TO_NOC_0_Y,
+                self._ALL_TENSIX_ROWS,
+                self._ALL_TENSIX_COLS,
+            )
+        return self._tensix_locations_cache
 
     def min_fw_version(self):
         return 0x2170000
@@ -211,53 +304,65 @@ class WhChip(TTChip):
 
 
 class RemoteWhChip(WhChip):
+    __slots__ = ()
+
+    HARDWARE_BROADCAST = False
+
+    # Remote chips can't use the hardware broadcast, so emulate it with one
+    # write per tensix core. The targets are built once and kept in row-major
+    # order rather than set hash order, giving a predictable NOC traffic pattern.
+    def _get_broadcast_cores(self):
+        if self._broadcast_cores is None:
+            self._broadcast_cores = tuple(
+                sorted(self.get_tensix_locations(), key=lambda c: (c[1], c[0]))
+            )
+        return self._broadcast_cores
+
     def noc_broadcast(self, noc: int, addr: int, data: bytes):
-        for core in self.get_tensix_locations():
-            self.luwen_chip.noc_write(noc, *core, addr, data)
+        noc_write = self.luwen_chip.noc_write
+        for x, y in self._get_broadcast_cores():
+            noc_write(noc, x, y, addr, data)
 
     def noc_broadcast32(self, noc: int, addr: int, data: int):
-        for core in self.get_tensix_locations():
-            self.luwen_chip.noc_write32(noc, *core, addr, data)
+        noc_write32 = self.luwen_chip.noc_write32
+        for x, y in self._get_broadcast_cores():
+            noc_write32(noc, x, y, addr, data)
 
 
 class GsChip(TTChip):
-    def __init__(self, *args, **kwargs):
-        self.GRID_SIZE_X = 13
-        self.GRID_SIZE_Y = 12
-        self.NUM_TENSIX_X = self.GRID_SIZE_X - 1
-        self.NUM_TENSIX_Y = self.GRID_SIZE_Y - 2
-
-        self.PHYS_X_TO_NOC_0_X = [0, 12, 1, 11, 2, 10, 3, 9, 4, 8, 5, 7, 6]
-        self.PHYS_Y_TO_NOC_0_Y = [0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6]
-        self.PHYS_X_TO_NOC_1_X = [12, 0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6]
-        self.PHYS_Y_TO_NOC_1_Y = [11, 0, 10, 1, 9, 2, 8, 3, 7, 4, 6, 5]
-        self.NOC_0_X_TO_PHYS_X = reverse_mapping_list(self.PHYS_X_TO_NOC_0_X)
-        self.NOC_0_Y_TO_PHYS_Y = reverse_mapping_list(self.PHYS_Y_TO_NOC_0_Y)
-        self.NOC_1_X_TO_PHYS_X = reverse_mapping_list(self.PHYS_X_TO_NOC_1_X)
-        self.NOC_1_Y_TO_PHYS_Y = reverse_mapping_list(self.PHYS_Y_TO_NOC_1_Y)
-
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
+
+    # Architecture constants, shared by every instance.
+    GRID_SIZE_X = 13
+    GRID_SIZE_Y = 12
+    NUM_TENSIX_X = GRID_SIZE_X - 1
+    NUM_TENSIX_Y = GRID_SIZE_Y - 2
+
+    PHYS_X_TO_NOC_0_X = bytes((0, 12, 1, 11, 2, 10, 3, 9, 4, 8, 5, 7, 6))
+    PHYS_Y_TO_NOC_0_Y = bytes((0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6))
+    PHYS_X_TO_NOC_1_X = bytes((12, 0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6))
+    PHYS_Y_TO_NOC_1_Y = bytes((11, 0, 10, 1, 9, 2, 8, 3, 7, 4, 6, 5))
+    NOC_0_X_TO_PHYS_X = bytes(reverse_mapping_list(PHYS_X_TO_NOC_0_X))
+    NOC_0_Y_TO_PHYS_Y = bytes(reverse_mapping_list(PHYS_Y_TO_NOC_0_Y))
+    NOC_1_X_TO_PHYS_X = bytes(reverse_mapping_list(PHYS_X_TO_NOC_1_X))
+    NOC_1_Y_TO_PHYS_Y = bytes(reverse_mapping_list(PHYS_Y_TO_NOC_1_Y))
+
+    # Harvesting bit b marks row b + 1, counted from the bottom of the grid, as
+    # bad. This folds the shift and the flip into one lookup to its NOC 0 row.
+    HARVEST_BIT_TO_NOC_0_Y = PHYS_Y_TO_NOC_0_Y[GRID_SIZE_Y - 2 :: -1]
+
+    _ALL_TENSIX_COLS = tuple(range(1, GRID_SIZE_X))
+    _ALL_TENSIX_ROWS = (1, 2, 3, 4, 5, 7, 8, 9, 10, 11)
 
     def get_tensix_locations(self):
-        bad_row_bits = self.get_harvest_bits()
-        bad_row_bits = bad_row_bits << 1
-
-        bad_physical_rows = self._int_to_bits(bad_row_bits)
-
-        disabled_rows = frozenset(
-            map(
-                lambda y: self.PHYS_Y_TO_NOC_0_Y[self.GRID_SIZE_Y - y - 1],
-                bad_physical_rows,
+        if self._tensix_locations_cache is None:
+            self._tensix_locations_cache = _good_tensix_cores(
+                self.get_harvest_bits(),
+                self.HARVEST_BIT_TO_NOC_0_Y,
+                self._ALL_TENSIX_ROWS,
+                self._ALL_TENSIX_COLS,
             )
-        )
-        good_rows = filter(
-            lambda y: y not in disabled_rows, [1, 2, 3, 4, 5, 7, 8, 9, 10, 11]
-        )
-        good_cores = list(
-            itertools.product(list(range(1, self.GRID_SIZE_X)), good_rows)
-        )
-
-        return set(good_cores)
+        return self._tensix_locations_cache
 
     def min_fw_version(self):
         return 0x1050000
@@ -266,79 +371,47 @@ class GsChip(TTChip):
         return f"Grayskull[{self.interface_id}]"
 
 
-def detect_local_chips(ignore_ethernet: bool = False) -> list[Union[GsChip, WhChip]]:
-    """
-    This will create a chip which only gaurentees that you have communication with the chip.
-    """
+def _upgrade_local_chip(device) -> Union[GsChip, WhChip]:
+    if not device.have_comms():
+        raise Exception(
+            f"Do not have communication with {device}, you should reset or remove this device from your system before continuing."
+        )
 
-    chip_count = 0
-    block_count = 0
-    last_draw = time.time()
+    device = device.force_upgrade()
 
-    def chip_detect_callback(status):
-        nonlocal chip_count, last_draw, block_count
+    if device.as_gs() is not None:
+        return GsChip(device.as_gs())
+    elif device.as_wh() is not None:
+        return WhChip(device.as_wh())
+    else:
+        raise ValueError("Did not recognize board")
 
-        if status.new_chip():
-            chip_count += 1
-        elif status.correct_down():
-            chip_count -= 1
-        chip_count = max(chip_count, 0)
-
-        if sys.stdout.isatty():
-            current_time = time.time()
-            if current_time - last_draw > 0.1:
-                last_draw = current_time
 
-                if block_count > 0:
-                    print(f"\033[{block_count}A", end="", flush=True)
-                    print(f"\033[J", end="", flush=True)
+def _wrap_chip(device) -> Union[GsChip, WhChip]:
+    if device.as_gs() is not None:
+        return GsChip(device.as_gs())
+    elif device.as_wh() is not None:
+        if device.is_remote():
+            return RemoteWhChip(device.as_wh())
+        else:
+            return WhChip(device.as_wh())
+    else:
+        raise ValueError("Did not recognize board")
 
-                print(f"\rDetected Chips: {chip_count}\n", end="", flush=True)
-                block_count = 1
 
-                status_string = status.status_string()
-                if status_string is not None:
-                    for line in status_string.splitlines():
-                        block_count += 1
-                        print(f"\r{line}", flush=True)
-        else:
-            time.sleep(0.01)
+def detect_local_chips(ignore_ethernet: bool = False) -> list[Union[GsChip, WhChip]]:
+    """
+    This will create a chip which only gaurentees that you have communication with the chip.
+    """
 
-    output = []
-    for device in luwen_detect_chips_fallible(
+    devices = luwen_detect_chips_fallible(
         local_only=True,
         continue_on_failure=False,
-        callback=chip_detect_callback,
+        callback=_ChipDetectProgress(),
         noc_safe=ignore_ethernet,
-    ):
-        if not device.have_comms():
-            raise Exception(
-                f"Do not have communication with {device}, you should reset or remove this device from your system before continuing."
-            )
-
-        device = device.force_upgrade()
-
-        if device.as_gs() is not None:
-            output.append(GsChip(device.as_gs()))
-        elif device.as_wh() is not None:
-            output.append(WhChip(device.as_wh()))
-        else:
-            raise ValueError("Did not recognize board")
-
-    return output
+    )
+    return [_upgrade_local_chip(device) for device in devices]
 
 
 def detect_chips(local_only: bool = False) -> list[Union[GsChip, WhChip]]:
-    output = []
-    for device in luwen_detect_chips(local_only=local_only):
-        if device.as_gs() is not None:
-            output.append(GsChip(device.as_gs()))
-        elif device.as_wh() is not None:
-            if device.is_remote():
-                output.append(RemoteWhChip(device.as_wh()))
-            else:
-                output.append(WhChip(device.as_wh()))
-        else:
-            raise ValueError("Did not recognize board")
-
-    return output
+    return [_wrap_chip(device) for device in luwen_detect_chips(local_only=local_only)]
@@ -6,6 +6,7 @@ from __future__ import annotations
 __all__ = ["CoreId", "TtxFile", "load_ttx_file", "TtxCompletionChecks"]
 
 from dataclasses import dataclass
+import io
 import itertools
 import re
 import struct
@@ -27,12 +28,20 @@ from typing import (
     ClassVar,
 )
 
-from yaml import safe_load
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 from tt_burnin.chip import TTChip as Chip
 
 DEFAULT_TIMEOUT_CYCLES = 100_000
 
+_COREID_RE = re.compile(r"(\d+)-(\d+)")
+_TTX_NAME_RE = re.compile(r"(\d+)-(\d+)/((?:image|ckernels)\.(bin|hex))")
+
 
 # [0] = x, [1] = y
 class CoreId(NamedTuple):
@@ -44,7 +53,7 @@ class CoreId(NamedTuple):
 
     @classmethod
     def parse(cls, text: AnyStr) -> "CoreId":
-        m = re.fullmatch(r"(\d+)-(\d+)", str(text))
+        m = _COREID_RE.fullmatch(str(text))
         if m is None:
             raise ValueError("Could not parse core id.")
         return cls(int(m[1]), int(m[2]))
@@ -57,7 +66,7 @@ class TtxFile(zipfile.ZipFile):
 
     def testdef(self) -> Any:
         if self._test_yaml is None:
-            self._test_yaml = safe_load(self.open("test.yaml"))
+            self._test_yaml = yaml.load(self.open("test.yaml"), Loader=_YamlLoader)
 
         return self._test_yaml
 
@@ -86,18 +95,22 @@ class ChunkHeader:
         b = f.read(ChunkHeader.CHUNK_HEADER_STRUCT.size)
         if len(b) == 0:
             return None
-        if len(b) != ChunkHeader.CHUNK_HEADER_STRUCT.size:
+
+        return ChunkHeader.unpack_from(b, 0)
+
+    @staticmethod
+    def unpack_from(buffer: bytes, offset: int) -> "ChunkHeader":
+        if len(buffer) - offset < ChunkHeader.CHUNK_HEADER_STRUCT.size:
             raise RuntimeError("Image file is truncated within chunk header.")
 
-        ch = ChunkHeader.CHUNK_HEADER_STRUCT.unpack(b)
+        ch = ChunkHeader.CHUNK_HEADER_STRUCT.unpack_from(buffer, offset)
         if ch[2] != 0:
             raise RuntimeError("Chunk header contains nonzero in MBZ field.")
 
         return ChunkHeader(*ch)
 
 
-def check_bin_header(f: IO[bytes]) -> None:
-    b = f.read(BIN_HEADER_STRUCT.size)
+def _validate_bin_header(b: bytes) -> None:
     if len(b) != BIN_HEADER_STRUCT.size:
         raise RuntimeError("Image file is truncated within binary file header.")
 
@@ -110,45 +123,91 @@ def check_bin_header(f: IO[bytes]) -> None:
         raise RuntimeError("Image file header contains nonzero in MBZ field.")
 
 
+def check_bin_header(f: IO[bytes]) -> None:
+    _validate_bin_header(f.read(BIN_HEADER_STRUCT.size))
+
+
 def read_bin_image_chunks(f: IO[bytes]) -> Iterable[Tuple[int, bytes]]:
-    check_bin_header(f)
+    # Parse the whole image from memory; chunks are yielded as views into it.
+    image = memoryview(f.read())
+    _validate_bin_header(image[: BIN_HEADER_STRUCT.size])
 
-    while True:
-        chunk_header = ChunkHeader.read(f)
-        if chunk_header is None:
-            break
+    offset = BIN_HEADER_STRUCT.size
+    while offset < len(image):
+        chunk_header = ChunkHeader.unpack_from(image, offset)
+        offset += ChunkHeader.CHUNK_HEADER_STRUCT.size
 
-        chunk_data = f.read(chunk_header.length)
-        if len(chunk_data) != chunk_header.length:
+        end = offset + chunk_header.length
+        if end > len(image):
             raise RuntimeError("Image file is truncated within data chunk.")
 
-        yield (chunk_header.address, chunk_data)
+        yield (chunk_header.address, image[offset:end])
+        offset = end
 
 
-def read_hex_image_chunks(f: IO[bytes]) -> Iterable[Tuple[int, bytes]]:
-    buffer = bytearray()
-    addr = None
-    for line in f.readlines():
-        if len(line.strip()) > 0:
-            if line.startswith(b"@"):
-                if len(buffer) > 0:
-                    assert addr is not None
-                    yield addr, buffer
-                # Word addr, so multiply it by 4 to turn it into byte address
-                addr = int(f"0x{line[1:].strip().decode()}", 0) * 4
-                buffer = bytearray()
-            else:
-                buffer.extend(
-                    int(f"0x{line.strip().decode()}", 0).to_bytes(4, "little")
-                )
-
-    if len(buffer) > 0:
-        assert addr is not None
-        yield addr, buffer
+def _hex_words_to_bytes(words: List[bytes]) -> bytearray:
+    # Each word is written most significant nibble first, so the decoded bytes
+    # of every 4-byte group need to be reversed to get the little-endian image.
+    if all(len(word) == 8 for word in words):
+        raw = bytes.fromhex(b"".join(words).decode())
+        data = bytearray(len(raw))
+        data[0::4] = raw[3::4]
+        data[1::4] = raw[2::4]
+        data[2::4] = raw[1::4]
+        data[3::4] = raw[0::4]
+        return data
 
+    return bytearray(
+        b"".join(map(lambda word: int(word, 16).to_bytes(4, "little"), words))
+    )
 
-def load_hex(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) -> None:
-    for address, data in read_hex_image_chunks(bin):
+
+def read_hex_image_chunks(f: IO[bytes]) -> Iterable[Tuple[int, bytes]]:
+    sections = f.read().split(b"@")
+
+    # Anything before the first address line has nowhere to go.
+    assert len(sections[0].split()) == 0
+
+    for section in sections[1:]:
+        tokens = section.split()
+        if len(tokens) > 1:
+            # Word addr, so multiply it by 4 to turn it into byte address
+            yield int(tokens[0], 16) * 4, _hex_words_to_bytes(tokens[1:])
+
+
+def _coalesce_chunks(
+    chunks: Iterable[Tuple[int, bytes]]
+) -> Iterable[Tuple[int, bytes]]:
+    # Merge chunks that continue exactly where the previous one ended so they
+    # go out as a single NoC transaction. Chunks that stand alone are passed
+    # through without a copy.
+    address = None
+    buffer: Any = None
+    merged = False
+    for chunk_address, data in chunks:
+        if address is not None and chunk_address == address + len(buffer):
+            if not merged:
+                buffer = bytearray(buffer)
+                merged = True
+            buffer += data
+            continue
+
+        if address is not None:
+            yield address, buffer
+        address = chunk_address
+        buffer = data
+        merged = False
+
+    if address is not None:
+        yield address, buffer
+
+
+def write_image_chunks(
+    chip: Chip,
+    cores: Optional[Collection[CoreId]],
+    chunks: Iterable[Tuple[int, bytes]],
+) -> None:
+    for address, data in _coalesce_chunks(chunks):
         if cores is None:
             chip.noc_broadcast(0, address, data)
         else:
@@ -156,41 +215,58 @@ def load_hex(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) ->
                 chip.noc_write(0, *core, address, data)
 
 
-def check_hex(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) -> None:
-    for address, data in read_hex_image_chunks(bin):
-        if cores is None:
-            cores = chip.get_tensix_locations()
+def load_hex(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) -> None:
+    write_image_chunks(chip, cores, read_hex_image_chunks(bin))
+
+
+def _first_mismatch(a: bytes, b: bytes, block_size: int = 4096) -> int:
+    # Narrow the search down with block compares before looking at single bytes.
+    va, vb = memoryview(a), memoryview(b)
+    start = 0
+    while va[start : start + block_size] == vb[start : start + block_size]:
+        start += block_size
+    end = start + block_size
+    return next(i for i in range(start, end) if va[i] != vb[i])
+
+
+def check_image_chunks(
+    chip: Chip,
+    cores: Optional[Collection[CoreId]],
+    chunks: Iterable[Tuple[int, bytes]],
+) -> None:
+    if cores is None:
+        cores = chip.get_tensix_locations()
+    cores = tuple(cores)
+
+    chunks = list(_coalesce_chunks(chunks))
+
+    # One read-back buffer sized for the largest chunk, sliced per read.
+    scratch = memoryview(bytearray(max((len(data) for _, data in chunks), default=0)))
+
+    for address, data in chunks:
+        buffer = scratch[: len(data)]
         for core in cores:
-            buffer = bytearray(len(data))
             chip.noc_read(0, *core, address, buffer)
             if buffer != data:
-                for b, d in zip(buffer, data):
-                    assert (
-                        b == d
-                    ), f"Failed to write to core {address} {core} ({b} != {d})"
+                i = _first_mismatch(buffer, data)
+                b, d = buffer[i], data[i]
+                assert b == d, f"Failed to write to core {address} {core} ({b} != {d})"
+
+
+def check_hex(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) -> None:
+    check_image_chunks(chip, cores, read_hex_image_chunks(bin))
 
 
 def load_bin(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) -> None:
-    for address, data in read_bin_image_chunks(bin):
-        if cores is None:
-            chip.noc_broadcast(0, address, data)
-        else:
-            for core in cores:
-                chip.noc_write(0, *core, address, data)
+    write_image_chunks(chip, cores, read_bin_image_chunks(bin))
 
 
 def check_bin(chip: Chip, cores: Optional[Collection[CoreId]], bin: IO[bytes]) -> None:
-    for address, data in read_bin_image_chunks(bin):
-        if cores is None:
-            cores = chip.get_tensix_locations()
-        for core in cores:
-            buffer = bytearray(len(data))
-            chip.noc_read(0, *core, address, buffer)
-            if buffer != data:
-                for b, d in zip(buffer, data):
-                    assert (
-                        b == d
-                    ), f"Failed to write to core {address} {core} ({b} != {d})"
+    check_image_chunks(chip, cores, read_bin_image_chunks(bin))
+
+
+_IMAGE_LOAD_ORDER = ("image.hex", "ckernels.hex", "image.bin", "ckernels.bin")
+_IMAGE_LOADERS = {"hex": (load_hex, check_hex), "bin": (load_bin, check_bin)}
 
 
 # core_mapping: use logical (source) to physical (target) mapping
@@ -200,18 +276,24 @@ def load_ttx_file(
 ) -> AbstractSet[CoreId]:
     all_tensix_cores = set(CoreId(*c) for c in chip.get_tensix_locations())
 
-    all_source_cores = set(core_mapping.keys())
-    all_target_cores = set(itertools.chain.from_iterable(core_mapping.values()))
-
-    if len(all_target_cores - all_tensix_cores) > 0:
-        details = ", ".join(map(str, sorted(all_target_cores - all_tensix_cores)))
-        raise RuntimeError(f"core_mapping targets cores that do not exist. ({details})")
+    all_source_cores = core_mapping.keys()
 
     broadcast = (
-        set(core_mapping.keys()) == set([CoreId(0, 0)])
+        len(core_mapping) == 1
+        and CoreId(0, 0) in core_mapping
         and set(core_mapping[CoreId(0, 0)]) == all_tensix_cores
     )
 
+    # A broadcast targets exactly the tensix cores, so only check other mappings.
+    if not broadcast:
+        missing_cores = set().union(*core_mapping.values()).difference(all_tensix_cores)
+
+        if missing_cores:
+            details = ", ".join(map(str, sorted(missing_cores)))
+            raise RuntimeError(
+                f"core_mapping targets cores that do not exist. ({details})"
+            )
+
     # find all X-Y/(image|ckernels).(bin|hex)
     # If non image.bin, fail.
     # If any hex, fail.
@@ -228,14 +310,21 @@ def load_ttx_file(
         "ckernels.hex": set(),
     }
 
+    # Every image entry per core, in the order load_core writes them.
+    core_to_files: Dict[CoreId, List[Tuple[int, zipfile.ZipInfo, str]]] = {}
+
     for info in infolist.values():
-        m = re.fullmatch(r"(\d+)-(\d+)/((?:image|ckernels)\.(bin|hex))", info.filename)
+        m = _TTX_NAME_RE.fullmatch(info.filename)
         if m:
             x = int(m[1])
             y = int(m[2])
 
             image_type = m[4]
 
+            core_to_files.setdefault(CoreId(x, y), []).append(
+                (_IMAGE_LOAD_ORDER.index(m[3]), info, image_type)
+            )
+
             # ignore empty images, they may exist for non-tensix cores
             if (image_type == "bin" and info.file_size > BIN_HEADER_STRUCT.size) or (
                 image_type == "hex" and info.file_size > 0
@@ -260,38 +349,38 @@ def load_ttx_file(
         details = ", ".join(map(str, sorted(ckernels_bins - image_bins)))
         raise RuntimeError(f"TTX has cores with ckernels but no image. ({details})")
 
-    if len(image_bins.union(image_hex) - all_source_cores) > 0:
-        details = ", ".join(
-            map(str, sorted(image_bins.union(image_hex) - all_source_cores))
-        )
+    unmapped_cores = image_bins.union(image_hex).difference(all_source_cores)
+    if unmapped_cores:
+        details = ", ".join(map(str, sorted(unmapped_cores)))
         raise RuntimeError(
             f"TTX has images for cores with no physical mapping. ({details})"
         )
 
+    # Read every entry that will be loaded up front, in archive order, so the
+    # zip is walked sequentially rather than seeking back and forth per core.
+    load_cores = [CoreId(0, 0)] if broadcast else image_bins
+    needed = sorted(
+        (info for core in load_cores for _, info, _ in core_to_files.get(core, ())),
+        key=lambda info: info.header_offset,
+    )
+    entry_contents = {info.filename: ttx.read(info) for info in needed}
+
     def load_core(
         load_core: CoreId, target_cores: Optional[Collection[CoreId]]
     ) -> None:
-        image_bin = f"{load_core}/image.bin"
-        ckernels_bin = f"{load_core}/ckernels.bin"
-
-        image_hex = f"{load_core}/image.hex"
-        ckernels_hex = f"{load_core}/ckernels.hex"
-
-        if image_hex in infolist:
-            load_hex(chip, target_cores, ttx.open(infolist[image_hex], mode="r"))
-            check_hex(chip, target_cores, ttx.open(infolist[image_hex], mode="r"))
-
-        if ckernels_hex in infolist:
-            load_hex(chip, target_cores, ttx.open(infolist[ckernels_hex], mode="r"))
-            check_hex(chip, target_cores, ttx.open(infolist[ckernels_hex], mode="r"))
-
-        if image_bin in infolist:
-            load_bin(chip, target_cores, ttx.open(infolist[image_bin], mode="r"))
-            check_bin(chip, target_cores, ttx.open(infolist[image_bin], mode="r"))
-
-        if ckernels_bin in infolist:
-            load_bin(chip, target_cores, ttx.open(infolist[ckernels_bin], mode="r"))
-            check_bin(chip, target_cores, ttx.open(infolist[ckernels_bin], mode="r"))
+        check_cores = target_cores
+        # A hardware broadcast lands on every core or none of them, so reading
+        # back one core is enough to verify it. An emulated broadcast is one
+        # write per core, so every core is still read back.
+        if check_cores is None and chip.HARDWARE_BROADCAST:
+            check_cores = [min(all_tensix_cores)]
+
+        for _, info, image_type in sorted(core_to_files.get(load_core, ())):
+            load, check = _IMAGE_LOADERS[image_type]
+            # Decompressed once; the same bytes are replayed for load and check.
+            contents = entry_contents.pop(info.filename)
+            load(chip, target_cores, io.BytesIO(contents))
+            check(chip, check_cores, io.BytesIO(contents))
 
     if broadcast:
         load_core(CoreId(0, 0), None)
@@ -299,7 +388,11 @@ def load_ttx_file(
 
     else:
         for source_core in image_bins:
-            load_core(source_core, core_mapping[source_core])
+            target_cores: Optional[Collection[CoreId]] = core_mapping[source_core]
+            # A logical core mapped onto every tensix can go out as a single broadcast.
+            if set(target_cores) == all_tensix_cores:
+                target_cores = None
+            load_core(source_core, target_cores)
         return image_bins
 
 
@@ -318,7 +411,7 @@ class AddressData:
             raise RuntimeError("Memory file does not start with address line.")
 
         address = int(line[1:], 16) * 4
-        data = b"".join(map(lambda line: int(line, 16).to_bytes(4, "little"), f))
+        data = bytes(_hex_words_to_bytes(f.read().split()))
 
         return cls(address, data)
 
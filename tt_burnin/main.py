@@ -8,9 +8,13 @@ from __future__ import annotations
 
 import os
 import sys
-import time
+import select
 import argparse
+import contextlib
+import functools
+import threading
 import tt_burnin
+from concurrent.futures import ThreadPoolExecutor, wait
 from rich.live import Live
 from rich.text import Text
 from rich.console import Group
@@ -24,7 +28,8 @@ from tt_burnin.utils import (
     pci_indices_from_json,
     pci_board_reset,
     print_all_available_devices,
-    generate_table,
+    build_table,
+    update_table,
 )
 from tt_tools_common.utils_common.tools_utils import (
     get_board_type,
@@ -32,40 +37,37 @@ from tt_tools_common.utils_common.tools_utils import (
 )
 
 
-def start_burnin_gs(
-    device, keep_trisc_under_reset: bool = False, stagger_start: bool = False
-):
-    BRISC_SOFT_RESET = 1 << 11
-    TRISC_SOFT_RESETS = (1 << 12) | (1 << 13) | (1 << 14)
-    NCRISC_SOFT_RESET = 1 << 18
-    STAGGERED_START_ENABLE = (1 << 31) if stagger_start else 0
+TENSIX_SOFT_RESET_ADDR = 0xFFB121B0
 
-    device.noc_broadcast32(
-        0, 0xFFB121B0, BRISC_SOFT_RESET | TRISC_SOFT_RESETS | NCRISC_SOFT_RESET
-    )
+BRISC_SOFT_RESET = 1 << 11
+TRISC_SOFT_RESETS = (1 << 12) | (1 << 13) | (1 << 14)
+NCRISC_SOFT_RESET = 1 << 18
+ALL_SOFT_RESETS = BRISC_SOFT_RESET | TRISC_SOFT_RESETS | NCRISC_SOFT_RESET
+# Soft reset values that release the cores to run the workload
+RUN_SOFT_RESETS = NCRISC_SOFT_RESET
+RUN_KEEP_TRISC_SOFT_RESETS = NCRISC_SOFT_RESET | TRISC_SOFT_RESETS
+STAGGERED_START_ENABLE = 1 << 31
 
-    # Deassert riscv reset
-    device.arc_msg(0xBA)
+GS_TTX = "gspv.ttx"
+WH_TTX = "whpv.ttx"
 
-    # Go busy
-    device.arc_msg(0x52)
 
-    with path("tt_burnin", "") as data_path:
-        load_ttx_file(
-            device,
-            TtxFile(str(data_path.joinpath("ttx/gspv.ttx"))),
-            {CoreId(0, 0): device.get_tensix_locations()},
-        )
-
-    if keep_trisc_under_reset:
-        soft_reset_value = (
-            NCRISC_SOFT_RESET | TRISC_SOFT_RESETS | STAGGERED_START_ENABLE
-        )
-    else:
-        soft_reset_value = NCRISC_SOFT_RESET | STAGGERED_START_ENABLE
+# Everything get_ttx_file keeps open, released by close_ttx_files
+_ttx_files = contextlib.ExitStack()
 
-    # Take cores out of reset
-    device.noc_broadcast32(0, 0xFFB121B0, soft_reset_value)
+
+@functools.lru_cache(maxsize=None)
+def get_ttx_file(name: str) -> TtxFile:
+    """Open a bundled ttx once and reuse it for every device and run"""
+    # The package resource has to stay resolved for as long as the file is open
+    data_path = _ttx_files.enter_context(path("tt_burnin", ""))
+    return _ttx_files.enter_context(TtxFile(str(data_path.joinpath(f"ttx/{name}"))))
+
+
+def close_ttx_files():
+    """Close every ttx opened by get_ttx_file"""
+    get_ttx_file.cache_clear()
+    _ttx_files.close()
 
 
 def reset_all_devices(devices, reset_filename=None):
@@ -92,32 +94,9 @@ def reset_all_devices(devices, reset_filename=None):
         pci_board_reset(dev_ids, reinit=True)
 
 
-def stop_burnin_gs(device):
-    BRISC_SOFT_RESET = 1 << 11
-    TRISC_SOFT_RESETS = (1 << 12) | (1 << 13) | (1 << 14)
-    NCRISC_SOFT_RESET = 1 << 18
-
-    # Go idle
-    device.arc_msg(0x54)
-
-    # Put tensix back under soft reset
-    device.noc_broadcast32(
-        0, 0xFFB121B0, BRISC_SOFT_RESET | TRISC_SOFT_RESETS | NCRISC_SOFT_RESET
-    )
-
-
-def start_burnin_wh(
-    device, keep_trisc_under_reset: bool = False, stagger_start: bool = False
-):
-    BRISC_SOFT_RESET = 1 << 11
-    TRISC_SOFT_RESETS = (1 << 12) | (1 << 13) | (1 << 14)
-    NCRISC_SOFT_RESET = 1 << 18
-    STAGGERED_START_ENABLE = (1 << 31) if stagger_start else 0
-
+def _load_burnin(device, ttx_name: str):
     # Put tensix under soft reset
-    device.noc_broadcast32(
-        0, 0xFFB121B0, BRISC_SOFT_RESET | TRISC_SOFT_RESETS | NCRISC_SOFT_RESET
-    )
+    device.noc_broadcast32(0, TENSIX_SOFT_RESET_ADDR, ALL_SOFT_RESETS)
 
     # Deassert riscv reset
     device.arc_msg(0xBA)
@@ -125,35 +104,134 @@ def start_burnin_wh(
     # Go busy
     device.arc_msg(0x52)
 
-    with path("tt_burnin", "") as data_path:
-        load_ttx_file(
-            device,
-            TtxFile(str(data_path.joinpath("ttx/whpv.ttx"))),
-            {CoreId(0, 0): device.get_tensix_locations()},
-        )
-
-    if keep_trisc_under_reset:
-        soft_reset_value = (
-            NCRISC_SOFT_RESET | TRISC_SOFT_RESETS | STAGGERED_START_ENABLE
-        )
-    else:
-        soft_reset_value = NCRISC_SOFT_RESET | STAGGERED_START_ENABLE
+    load_ttx_file(
+        device,
+        get_ttx_file(ttx_name),
+        {CoreId(0, 0): device.get_tensix_locations()},
+    )
 
-    # Take cores out of reset
-    device.noc_broadcast32(0, 0xFFB121B0, soft_reset_value)
 
+def _release_burnin(
+    device, keep_trisc_under_reset: bool = False, stagger_start: bool = False
+):
+    soft_reset_value = (
+        RUN_KEEP_TRISC_SOFT_RESETS if keep_trisc_under_reset else RUN_SOFT_RESETS
+    ) | (STAGGERED_START_ENABLE if stagger_start else 0)
+
+    # Take cores out of reset
+    device.noc_broadcast32(0, TENSIX_SOFT_RESET_ADDR, soft_reset_value)
 
-def stop_burnin_wh(device):
-    BRISC_SOFT_RESET = 1 << 11
-    TRISC_SOFT_RESETS = (1 << 12) | (1 << 13) | (1 << 14)
-    NCRISC_SOFT_RESET = 1 << 18
 
+def _stop_burnin(device):
     # Go idle
     device.arc_msg(0x54)
 
     # Put tensix back under soft reset
-    device.noc_broadcast32(
-        0, 0xFFB121B0, BRISC_SOFT_RESET | TRISC_SOFT_RESETS | NCRISC_SOFT_RESET
+    device.noc_broadcast32(0, TENSIX_SOFT_RESET_ADDR, ALL_SOFT_RESETS)
+
+
+# (stop, ttx) for each supported chip type
+CHIP_HANDLERS = {
+    GsChip: (_stop_burnin, GS_TTX),
+    WhChip: (_stop_burnin, WH_TTX),
+    RemoteWhChip: (_stop_burnin, WH_TTX),
+}
+
+
+def _chip_handlers(device):
+    # Walk the mro so subclasses of a supported chip type use its handlers
+    for chip_type in type(device).__mro__:
+        handlers = CHIP_HANDLERS.get(chip_type)
+        if handlers is not None:
+            return handlers
+    raise NotImplementedError(f"Don't support {device}")
+
+
+def group_by_interface(devices, key=lambda device: device):
+    """Group devices by the pci interface they are reached through"""
+    # Remote chips are reached through their local chip's pci interface, so
+    # everything behind one interface has to be handled by a single worker.
+    by_interface = {}
+    for item in devices:
+        by_interface.setdefault(key(item).interface_id, []).append(item)
+    return list(by_interface.values())
+
+
+def start_burnin(devices, release_barrier=None, started=None):
+    """
+    Load burnin onto devices sharing a pci interface one at a time, then
+    release their cores once every group has been loaded.
+    Each device and its stop function is recorded in started.
+    """
+    try:
+        for device in devices:
+            stop, ttx_name = _chip_handlers(device)
+            # Register before touching the device so a partial start is still stopped
+            if started is not None:
+                started.append((device, stop))
+            _load_burnin(device, ttx_name)
+
+        if release_barrier is not None:
+            release_barrier.wait()
+
+        for device in devices:
+            _release_burnin(device)
+    except BaseException:
+        # Let the other groups stop waiting for this one
+        if release_barrier is not None:
+            release_barrier.abort()
+        raise
+
+
+def _stop_started(started_devices):
+    for device, stop in started_devices:
+        stop(device)
+
+
+def run_on_groups(executor, func, groups, abort=None):
+    """Run func on each group of devices in parallel, one worker per group"""
+    futures = [executor.submit(func, group) for group in groups]
+    try:
+        wait(futures)
+    except BaseException:
+        # Don't leave workers touching devices behind our back (e.g. on ctrl-c)
+        for future in futures:
+            future.cancel()
+        if abort is not None:
+            abort()
+        wait(futures)
+        raise
+
+    errors = [e for e in (future.exception() for future in futures) if e is not None]
+    # Report the failure that broke the barrier rather than the groups it released
+    errors.sort(key=lambda e: isinstance(e, threading.BrokenBarrierError))
+    if errors:
+        raise errors[0]
+
+
+def start_burnin_on_devices(executor, devices, started):
+    """
+    Start burnin on all devices, one worker per pci interface.
+    The cores on all devices are released together once every group is loaded.
+    """
+    groups = group_by_interface(devices)
+    release_barrier = threading.Barrier(max(len(groups), 1))
+    run_on_groups(
+        executor,
+        functools.partial(
+            start_burnin, release_barrier=release_barrier, started=started
+        ),
+        groups,
+        abort=release_barrier.abort,
+    )
+
+
+def stop_burnin_on_devices(executor, started):
+    """Stop burnin on every device start_burnin_on_devices has touched"""
+    run_on_groups(
+        executor,
+        _stop_started,
+        group_by_interface(started, key=lambda started_device: started_device[0]),
     )
 
 
@@ -184,8 +262,6 @@ def parse_args():
 def main():
     args = parse_args()
     os.environ["RUST_BACKTRACE"] = "full"
-    # Allow non blocking read for accepting user input before stopping burnin
-    os.set_blocking(sys.stdin.fileno(), False)
     devices = detect_chips_with_callback()
     devs = []
     for device in devices:
@@ -199,52 +275,65 @@ def main():
         else:
             raise ValueError("Did not recognize board")
     print_all_available_devices(devices)
-    reset_all_devices(devices, reset_filename=args.reset)
 
-    try:
-        print()
-        print(
-            CMD_LINE_COLOR.BLUE,
-            "Starting TT-Burnin workload on all boards. WARNING: Opening SMI might cause unexpected behavior",
-            CMD_LINE_COLOR.ENDC,
-        )
-        for device in devs:
-            if isinstance(device, GsChip):
-                start_burnin_gs(device)
-            elif isinstance(device, WhChip):
-                start_burnin_wh(device)
-            else:
-                raise NotImplementedError(f"Don't support {device}")
-
-        text = Text(
-            " Press Enter to STOP TT-Burnin on all boards...", style="bold yellow"
-        )
-
-        # Create a live update for telemetry widget
-        with Live(Group(generate_table(devices), text), refresh_per_second=10) as live:
-            while True:
-                # Break if there is any user keypress
-                c = sys.stdin.read(1)
-                if len(c) > 0:
-                    break
-                live.update(Group(generate_table(devices), text))
-                time.sleep(0.1)
-
-    finally:
-        print()
-        print(
-            CMD_LINE_COLOR.GREEN,
-            "Stopping TT-Burnin workload on all boards.",
-            CMD_LINE_COLOR.ENDC,
-        )
-        print()
-        for device in devs:
-            if isinstance(device, GsChip):
-                stop_burnin_gs(device)
-            elif isinstance(device, WhChip):
-                stop_burnin_wh(device)
-            else:
-                raise NotImplementedError(f"Don't support {device}")
+    with contextlib.ExitStack() as cleanup, ThreadPoolExecutor(
+        max_workers=max(len(devs), 1), thread_name_prefix="tt-burnin"
+    ) as executor:
+        # Close the ttx files once the workers using them have shut down
+        cleanup.callback(close_ttx_files)
+
+        # Open the ttx files needed while the boards are resetting
+        ttx_names = {_chip_handlers(device)[1] for device in devs}
+        ttx_prefetch = [executor.submit(get_ttx_file, name) for name in ttx_names]
 
-        # Final reset to restore state
         reset_all_devices(devices, reset_filename=args.reset)
+
+        for future in ttx_prefetch:
+            future.result()
+
+        # (device, stop function) for every device start_burnin has touched
+        started = []
+        try:
+            print()
+            print(
+                CMD_LINE_COLOR.BLUE,
+                "Starting TT-Burnin workload on all boards. WARNING: Opening SMI might cause unexpected behavior",
+                CMD_LINE_COLOR.ENDC,
+            )
+            start_burnin_on_devices(executor, devs, started)
+
+            text = Text(
+                " Press Enter to STOP TT-Burnin on all boards...", style="bold yellow"
+            )
+
+            # Build the telemetry widget once; the loop only refreshes its cells
+            table, cells = build_table(devices)
+            update_table(cells, devices)
+
+            # Create a live update for telemetry widget
+            with Live(Group(table, text), auto_refresh=False) as live:
+                # Wait on stdin between refreshes; once it hits EOF there is nothing
+                # left to wait for and select just paces the refresh
+                watch = [sys.stdin]
+                while True:
+                    ready, _, _ = select.select(watch, [], [], 0.1)
+                    if ready:
+                        # Break if there is any user input
+                        if sys.stdin.readline():
+                            break
+                        watch = []
+                    update_table(cells, devices)
+                    live.refresh()
+
+        finally:
+            print()
+            print(
+                CMD_LINE_COLOR.GREEN,
+                "Stopping TT-Burnin workload on all boards.",
+                CMD_LINE_COLOR.ENDC,
+            )
+            print()
+            stop_burnin_on_devices(executor, started)
+
+            # Final reset to restore state
+            reset_all_devices(devices, reset_filename=args.reset)
@@ -1,13 +1,14 @@
 # SPDX-FileCopyrightText: © 2024 Tenstorrent AI ULC
 # SPDX-License-Identifier: Apache-2.0
-from typing import List
+from typing import List, Optional, Tuple
 import sys
 import os
 import json
-import jsons
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from rich.table import Table
+from rich.text import Text
 
 from rich import get_console
 from pyluwen import PciChip
@@ -21,20 +22,40 @@ from tt_tools_common.utils_common.tools_utils import (
 )
 
 
+def _try_pcichip(pci_idx: int) -> Optional[PciChip]:
+    try:
+        return PciChip(pci_interface=pci_idx)
+    except Exception:
+        return None
+
+
+def _wh_full_lds_reset(pci_interfaces: List[int]):
+    WHChipReset().full_lds_reset(pci_interfaces=pci_interfaces, silent=True)
+
+
+def _gs_tensix_reset(device):
+    GSTensixReset(device).tensix_reset(silent=True)
+
+
 def pci_board_reset(list_of_boards: List[int], reinit=False):
     """Given a list of pci index's init the pci chip and call reset on it"""
 
+    # Opening a chip blocks on the device, so probe all boards at once
+    with ThreadPoolExecutor(
+        max_workers=max(min(32, len(list_of_boards)), 1)
+    ) as executor:
+        chips = list(executor.map(_try_pcichip, list_of_boards))
+
     reset_wh_pci_idx = []
     reset_gs_devs = []
-    for pci_idx in list_of_boards:
-        try:
-            chip = PciChip(pci_interface=pci_idx)
-        except Exception as e:
+    for pci_idx, chip in zip(list_of_boards, chips):
+        if chip is None:
             print(
                 CMD_LINE_COLOR.RED,
                 f"Error accessing board at pci index {pci_idx}! Use -ls to see all devices available to reset",
                 CMD_LINE_COLOR.ENDC,
             )
+            continue
         if chip.as_wh():
             reset_wh_pci_idx.append(pci_idx)
         elif chip.as_gs():
@@ -47,14 +68,20 @@ def pci_board_reset(list_of_boards: List[int], reinit=False):
             )
             sys.exit(1)
 
-    # reset wh devices with pci indices
-    if reset_wh_pci_idx:
-        WHChipReset().full_lds_reset(pci_interfaces=reset_wh_pci_idx, silent=True)
-
-    # reset gs devices by creating a partially init backend
-    if reset_gs_devs:
-        for i, device in enumerate(reset_gs_devs):
-            GSTensixReset(device).tensix_reset(silent=True)
+    # The families touch disjoint boards, and each gs board resets independently,
+    # so all the resets run at the same time
+    if reset_wh_pci_idx or reset_gs_devs:
+        with ThreadPoolExecutor(max_workers=len(reset_gs_devs) + 1) as executor:
+            resets = []
+            # reset wh devices with pci indices
+            if reset_wh_pci_idx:
+                resets.append(executor.submit(_wh_full_lds_reset, reset_wh_pci_idx))
+            # reset gs devices by creating a partially init backend
+            resets.extend(
+                executor.submit(_gs_tensix_reset, device) for device in reset_gs_devs
+            )
+            for reset in as_completed(resets):
+                reset.result()
 
     if reinit:
         # Enable backtrace for debugging
@@ -80,18 +107,18 @@ def pci_indices_from_json(json_dict):
     """Parse pci_list from reset json"""
     pci_indices = []
     reinit = False
-    if "gs_tensix_reset" in json_dict.keys():
+    if "gs_tensix_reset" in json_dict:
         pci_indices.extend(json_dict["gs_tensix_reset"]["pci_index"])
-    if "wh_link_reset" in json_dict.keys():
+    if "wh_link_reset" in json_dict:
         pci_indices.extend(json_dict["wh_link_reset"]["pci_index"])
-    if "re_init_devices" in json_dict.keys():
+    if "re_init_devices" in json_dict:
         reinit = json_dict["re_init_devices"]
     return pci_indices, reinit
 
 
 def mobo_reset_from_json(json_dict) -> dict:
     """Parse pci_list from reset json and init mobo reset"""
-    if "wh_mobo_reset" in json_dict.keys():
+    if "wh_mobo_reset" in json_dict:
         mobo_dict_list = []
         for mobo_dict in json_dict["wh_mobo_reset"]:
             # Only add the mobos that have a name
@@ -102,14 +129,12 @@ def mobo_reset_from_json(json_dict) -> dict:
             GalaxyReset().warm_reset_mobo(mobo_dict_list)
             # If there are mobos to reset, remove link reset pci index's from the json
             try:
-                wh_link_pci_indices = json_dict["wh_link_reset"]["pci_index"]
+                wh_link_pci_indices = set(json_dict["wh_link_reset"]["pci_index"])
                 for entry in mobo_dict_list:
-                    if "nb_host_pci_idx" in entry.keys() and entry["nb_host_pci_idx"]:
+                    if "nb_host_pci_idx" in entry and entry["nb_host_pci_idx"]:
                         # remove the list of WH pcie index's from the reset list
-                        wh_link_pci_indices = list(
-                            set(wh_link_pci_indices) - set(entry["nb_host_pci_idx"])
-                        )
-                json_dict["wh_link_reset"]["pci_index"] = wh_link_pci_indices
+                        wh_link_pci_indices.difference_update(entry["nb_host_pci_idx"])
+                json_dict["wh_link_reset"]["pci_index"] = list(wh_link_pci_indices)
             except Exception as e:
                 print(
                     CMD_LINE_COLOR.RED,
@@ -155,23 +180,24 @@ def print_all_available_devices(devices):
     table.add_column("Device Series")
     table.add_column("Board Number")
     table.add_column("Coordinates")
-    for i, device in enumerate(devices):
-        board_id = hex(device.board_id()).replace("0x", "")
+    for device in devices:
+        wh_device = device.as_wh()
+        board_id = f"{device.board_id():x}"
         board_type = get_board_type(board_id)
         device_series = "grayskull" if device.as_gs() else "wormhole"
         pci_dev_id = device.get_pci_interface_id() if not device.is_remote() else "N/A"
-        if device.as_wh():
+        if wh_device:
+            local_coord = wh_device.get_local_coord()
             coords = [
-                device.as_wh().get_local_coord().shelf_x,
-                device.as_wh().get_local_coord().shelf_y,
-                device.as_wh().get_local_coord().rack_x,
-                device.as_wh().get_local_coord().rack_y,
+                local_coord.shelf_x,
+                local_coord.shelf_y,
+                local_coord.rack_x,
+                local_coord.rack_y,
             ]
-        else:
-            coords = "N/A"
-        if device.as_wh():
             suffix = " R" if device.is_remote() else " L"
             board_type = board_type + suffix
+        else:
+            coords = "N/A"
 
         table.add_row(
             f"{pci_dev_id}",
@@ -183,15 +209,57 @@ def print_all_available_devices(devices):
     console.print(table)
 
 
+# Indexed by whether the value is within 15% of its limit
+_COLORS = ("[green]", "[orange3]")
+
+
 def prefix_color_picker(current_value, max_value):
-    if current_value < max_value * 0.85:
-        return "[green]"
-    else:
-        return "[orange3]"
+    return _COLORS[current_value >= max_value * 0.85]
+
+
+class TableCell:
+    """Table cell whose markup can be swapped out between renders"""
+
+    __slots__ = ("markup",)
+
+    def __init__(self, markup: str = ""):
+        self.markup = markup
+
+    def __rich__(self) -> Text:
+        return Text.from_markup(self.markup)
+
+
+# Telemetry fields are packed registers, described as (name, shift, mask, divisor)
+# Each column shows a value against its limit: (value, limit, format, colored)
+TELEMETRY_COLUMNS = (
+    (
+        ("smbus_tx_vcore", 0, None, 1000),
+        ("smbus_tx_vdd_limits", 16, None, 1000),
+        "4.2f",
+        False,
+    ),
+    (("smbus_tx_tdc", 0, 0xFFFF, 1), ("smbus_tx_tdc", 16, None, 1), "5.1f", True),
+    (("smbus_tx_aiclk", 0, 0xFFFF, 1), ("smbus_tx_aiclk", 16, None, 1), "4.0f", True),
+    (("smbus_tx_tdp", 0, 0xFFFF, 1), ("smbus_tx_tdp", 16, None, 1), "5.1f", True),
+    (
+        ("smbus_tx_asic_temperature", 0, 0xFFFF, 16),
+        ("smbus_tx_thm_limits", 0, 0xFFFF, 1),
+        "4.1f",
+        True,
+    ),
+)
+
+
+def _telemetry_value(telem, field) -> float:
+    name, shift, mask, divisor = field
+    value = getattr(telem, name) >> shift
+    if mask is not None:
+        value &= mask
+    return value / divisor
 
 
-def generate_table(devices) -> Table:
-    """Make a new table."""
+def build_table(devices) -> Tuple[Table, List[List[TableCell]]]:
+    """Make the telemetry table once, returning it along with its per device row cells"""
     table = Table(
         title=" ",
     )
@@ -202,27 +270,23 @@ def generate_table(devices) -> Table:
     table.add_column("Power (W)")
     table.add_column("Core Temp (°C)")
 
-    for i, dev in enumerate(devices):
-        telem = jsons.dump(dev.get_telemetry())
-        current = int(hex(telem["smbus_tx_tdc"]), 16) & 0xFFFF
-        voltage = int(hex(telem["smbus_tx_vcore"]), 16) / 1000
-        aiclk = int(hex(telem["smbus_tx_aiclk"]), 16) & 0xFFFF
-        power = int(hex(telem["smbus_tx_tdp"]), 16) & 0xFFFF
-        asic_temperature = (
-            int(hex(telem["smbus_tx_asic_temperature"]), 16) & 0xFFFF
-        ) / 16
-        vdd_max = int(hex(telem["smbus_tx_vdd_limits"]), 16) >> 16
-        curr_limit = int(hex(telem["smbus_tx_tdc"]), 16) >> 16
-        aiclk_limit = int(hex(telem["smbus_tx_aiclk"]), 16) >> 16
-        pwr_limit = int(hex(telem["smbus_tx_tdp"]), 16) >> 16
-        thm_limit = int(hex(telem["smbus_tx_thm_limits"]), 16) & 0xFFFF
-        table.add_row(
-            f"{i}",
-            f"{voltage:4.2f}[light_goldenrod1] / {vdd_max/1000:4.2f}",
-            f"{prefix_color_picker(current, curr_limit)}{current:5.1f}[light_goldenrod1] / {curr_limit:5.1f}",
-            f"{prefix_color_picker(aiclk, aiclk_limit)}{aiclk:4.0f}[light_goldenrod1] / {aiclk_limit:4.0f}",
-            f"{prefix_color_picker(power, pwr_limit)}{power:5.1f}[light_goldenrod1] / {pwr_limit:5.1f}",
-            f"{prefix_color_picker(asic_temperature, thm_limit)}{asic_temperature:4.1f}[light_goldenrod1] / {thm_limit:4.1f}",
-        )
+    cells = []
+    for i, _ in enumerate(devices):
+        row = [TableCell(f"{i}")] + [TableCell() for _ in TELEMETRY_COLUMNS]
+        table.add_row(*row)
+        cells.append(row)
+
+    return table, cells
+
 
-    return table
+def update_table(cells: List[List[TableCell]], devices) -> None:
+    """Refresh the telemetry values in the cells made by build_table"""
+    for row, dev in zip(cells, devices):
+        telem = dev.get_telemetry()
+        for cell, (value_field, limit_field, fmt, colored) in zip(
+            row[1:], TELEMETRY_COLUMNS
+        ):
+            value = _telemetry_value(telem, value_field)
+            limit = _telemetry_value(telem, limit_field)
+            prefix = prefix_color_picker(value, limit) if colored else ""
+            cell.markup = f"{prefix}{value:{fmt}}[light_goldenrod1] / {limit:{fmt}}"